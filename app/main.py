@@ -1,9 +1,174 @@
 import json
+import os
 import re
+import sqlite3
+import string
+import sys
+from bisect import bisect_left
+from collections import defaultdict
 from datetime import date
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import Dict, Union, List
+from functools import lru_cache
+from typing import Dict, NamedTuple, Union, List
+
+# orjson (C/Rust-реализация) заметно быстрее стандартного json на разборе и сериализации,
+# но является необязательной зависимостью — при его отсутствии откатываемся на stdlib.
+try:
+    import orjson
+
+    def _loads(raw: bytes) -> List[Dict]:
+        return orjson.loads(raw)
+
+    def _dumps(data: List[Dict]) -> bytes:
+        return orjson.dumps(data)
+
+except ImportError:
+    orjson = None
+
+    def _loads(raw: bytes) -> List[Dict]:
+        return json.loads(raw)
+
+    def _dumps(data: List[Dict]) -> bytes:
+        # компактные разделители: pretty-print почти удваивает объём записываемых байт
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Интернированные константы статуса книги: все статусы в памяти указывают на эти объекты,
+# поэтому сравнение статусов сводится к проверке идентичности указателей.
+AVAILABLE = sys.intern("В наличии")
+BORROWED = sys.intern("Выдана")
+# таблица переключения статуса: одна dict-выборка вместо ветвления по строке
+_NEXT_STATUS = {AVAILABLE: BORROWED, BORROWED: AVAILABLE}
+
+def _intern_book(book: Dict) -> Dict:
+    """
+    Функция для интернирования ключей и строковых значений словаря книги.
+    Пять ключей и повторяющиеся авторы/статусы становятся общими объектами
+    для всех книг: меньше памяти, а сравнение строк начинается с проверки
+    идентичности указателей.
+    """
+    return {
+        sys.intern(key): sys.intern(value) if isinstance(value, str) else value
+        for key, value in book.items()
+    }
+
+
+# Надгробие для лениво удалённых книг: запись помечается вместо O(n)-сдвига list.pop.
+_DELETED = object()
+
+# Пути к файлам хранилища: снимок библиотеки, журнал мутаций и SQLite-база.
+_LIBRARY_PATH = "app/library.json"
+_JOURNAL_PATH = "app/library.jsonl"
+_DATABASE_PATH = "app/library.db"
+# Журнал компактизируется, когда число записей в нём превышает размер библиотеки в это число раз.
+_JOURNAL_COMPACT_FACTOR = 2
+
+# Текущий год вычисляется один раз при импорте: за время жизни процесса он фактически
+# не меняется, а date.today() на каждом создании книги стоит системного вызова.
+_CURRENT_YEAR = date.today().year
+
+# Прекомпилированные регулярные выражения для валидаторов Book.
+# Компиляция на уровне модуля избавляет от обращения к внутреннему кэшу re при каждом вызове,
+# а \Z в конце каждой альтернативы гарантирует совпадение со всей строкой целиком.
+_TITLE_RE = re.compile(
+    r"^[A-Za-zА-Яа-яЁё]{2}[A-Za-zА-Яа-яЁё0-9\s\.,;:!?()\'\"\-]*\Z"
+    r"|^\d{1,4}[A-Za-zА-Яа-яЁё\s\.,;:!?()\'\"\-]+\Z"
+    r"|^\d{4}\Z"
+)
+_AUTHOR_RE = re.compile(
+    r"^[A-Za-zА-Яа-яЁё]{2,}(?:['\-\s][A-Za-zА-Яа-яЁё]+)+\Z"
+    r"|^[A-Za-zА-Яа-яЁё]{5,}\Z"
+)
+
+# Аварийный переключатель на старый путь валидации названия через регулярное выражение.
+_USE_REGEX_TITLE_VALIDATION = False
+
+# Наборы допустимых символов для ручного валидатора названия.
+# Набор кириллицы соответствует классу [А-Яа-яЁё] из регулярного выражения.
+_CYRILLIC_LETTERS = "".join(map(chr, range(ord("А"), ord("я") + 1))) + "Ёё"
+_LETTER_CHARS = frozenset(string.ascii_letters + _CYRILLIC_LETTERS)
+_TITLE_PUNCT_CHARS = frozenset(string.whitespace + ".,;:!?()'\"-")
+_TITLE_BODY_CHARS = _LETTER_CHARS | frozenset(string.digits) | _TITLE_PUNCT_CHARS
+_TITLE_TAIL_CHARS = _LETTER_CHARS | _TITLE_PUNCT_CHARS
+
+
+def _validate_title_fast(title: str) -> bool:
+    """
+    Ручной валидатор названия книги, эквивалентный _TITLE_RE.
+    Грамматика простая (две буквы в начале, либо 1-4 цифры с текстом, либо ровно 4 цифры),
+    поэтому прямой проход по строке обходится без бэктрекинга движка re по трём альтернативам.
+    """
+    if len(title) < 2:
+        return False
+
+    first = title[0]
+    if first in _LETTER_CHARS:
+        # альтернатива 1: две буквы, затем любые допустимые символы
+        if title[1] not in _LETTER_CHARS:
+            return False
+        return all(char in _TITLE_BODY_CHARS for char in title[2:])
+
+    if first.isdigit():
+        # считаем длину цифрового префикса
+        digits_end = 1
+        while digits_end < len(title) and title[digits_end].isdigit():
+            digits_end += 1
+
+        if digits_end == len(title):
+            # альтернатива 3: строка только из цифр допустима, если это ровно 4 цифры (год)
+            return digits_end == 4
+
+        # альтернатива 2: 1-4 цифры, затем хотя бы один символ без цифр
+        if digits_end > 4:
+            return False
+        return all(char in _TITLE_TAIL_CHARS for char in title[digits_end:])
+
+    return False
+
+
+@lru_cache(maxsize=4096)
+def _validate_title(title: str) -> str:
+    """
+    Функция для валидации названия книги.
+    Мемоизирована: повторяющиеся названия не проходят валидацию заново.
+    """
+    if _USE_REGEX_TITLE_VALIDATION:
+        is_valid = _TITLE_RE.match(title) is not None
+    else:
+        is_valid = _validate_title_fast(title)
+
+    if is_valid:
+        return title.strip().title()
+    raise ValueError("Недопустимое название книги")
+
+
+@lru_cache(maxsize=4096)
+def _validate_author(author: str) -> str:
+    """
+    Функция для валидации автора книги.
+    Мемоизирована: у одного автора обычно много книг, и повторный вызов
+    возвращает готовую строку из кэша, минуя регулярное выражение.
+    """
+    if _AUTHOR_RE.match(author):
+        return author.strip().title()
+    raise ValueError("Недопустимое имя автора. Ожидается строка с буквами, пробелами или дефисами.")
+
+
+def _validate_year(year) -> int:
+    """
+    Функция для валидации года издания книги
+    """
+    if not isinstance(year, int):
+        try:
+            year = int(year)
+        except ValueError as exc:
+            raise ValueError("Год должен быть целым числом.") from exc
+
+    if year <= 0 or year > _CURRENT_YEAR:
+        raise ValueError("Год должен быть положительным числом и не превышать текущий год.")
+
+    return year
 
 
 class NotFoundInTheLibrary(Exception):
@@ -29,101 +194,46 @@ class AlreadyInTheLibrary(Exception):
     pass
 
 
-class Book:
+class _BookRecord(NamedTuple):
     """
-    Класс для хранение информации о конкретной книги
+    Неизменяемое хранилище полей книги.
+    NamedTuple держит поля в обычном кортеже: меньше памяти на экземпляр,
+    а доступ к атрибутам не проходит через дескрипторы слотов.
     """
-    
-    __slots__ = ("_id", "_title", "_author", "_year", "_status")
-
-    def __init__(self, last_added_book_id: int, title: str, author: str, year: int):
-        # генерируем уникальный id для книги просто добавляя 1 к последнему номеру в библиотеке
-        self._id = last_added_book_id + 1
-        self._title = self._validate_title(title)
-        self._author = self._validate_author(author)
-        self._year = self._validate_year(year)
-        self._status = "В наличии"
-
-    def __str__(self):
-        return f"{self._title} by {self._author}"
 
+    id: int
+    title: str
+    author: str
+    year: int
+    status: str
 
-    def _validate_title(self, title: str) -> str:
-        """
-        Функция для валидации названия книги
-        """
-        regex = (
-                    r"^[A-Za-zА-Яа-яЁё]{2}[A-Za-zА-Яа-яЁё0-9\s\.,;:!?()\'\"\-]*$"
-                    r"|^\d{1,4}[A-Za-zА-Яа-яЁё\s\.,;:!?()\'\"\-]+$"
-                    r"|^\d{4}$"
-                )
-        match = re.search(regex, title)
-        
-        if match and match.group(0) == title:
-            return title.strip().title()
-        raise ValueError("Недопустимое название книги")
-
-    def _validate_year(self, year) -> int:
-        """
-        Функция для валидации года издания книги
-        """
-        try:
-            year = int(year)
-        except ValueError as exc:
-            raise ValueError("Год должен быть целым числом.") from exc
-
-        if year <= 0 or year > date.today().year:
-            raise ValueError("Год должен быть положительным числом и не превышать текущий год.")
-        
-        return year
 
-    def _validate_author(self, author: str) -> str:
-        """
-        Функция для валидации автора книги
-        """
-        regex = r"^[A-Za-zА-Яа-яЁё]{2,}(?:['\-\s][A-Za-zА-Яа-яЁё]+)+$|^[A-Za-zА-Яа-яЁё]{5,}$"
-        match = re.search(regex, author)
-
-        if match and match.group(0) == author:
-            return author.strip().title()
-        raise ValueError("Недопустимое имя автора. Ожидается строка с буквами, пробелами или дефисами.")
-        
-    @property
-    def id(self) -> int:
-        """Свойство для получения атрибута id."""
-        return self._id
-
-    @property
-    def title(self) -> str:
-        """Свойство для получения атрибута title."""
-        return self._title
+class Book(_BookRecord):
+    """
+    Класс для хранение информации о конкретной книги
+    """
 
-    @property
-    def author(self) -> str:
-        """Свойство для получения атрибута author."""
-        return self._author
+    __slots__ = ()
 
-    @property
-    def year(self) -> int:
-        """Свойство для получения атрибута year."""
-        return self._year
+    def __new__(cls, last_added_book_id: int, title: str, author: str, year: int):
+        # генерируем уникальный id для книги просто добавляя 1 к последнему номеру в библиотеке
+        return super().__new__(
+            cls,
+            last_added_book_id + 1,
+            _validate_title(title),
+            _validate_author(author),
+            _validate_year(year),
+            AVAILABLE,
+        )
 
-    @property
-    def status(self) -> str:
-        """Свойство для получения атрибута status."""
-        return self._status
+    def __str__(self):
+        return f"{self.title} by {self.author}"
 
     def to_dict(self) -> Dict[str, Union[int, str]]:
         """
         Метод для преобразования данных из экзмепляра объекта Book в сериализируемый словарь(dict).
         """
-        return {
-            "id": self.id,
-            "title": self.title,
-            "author": self.author,
-            "year": self.year,
-            "status": self.status,
-        }
+        return self._asdict()
 
 
 @dataclass
@@ -134,24 +244,268 @@ class Library:
     
     _books_data: list = field(default_factory=list)
 
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _load(path: str, mtime: float) -> List[Dict]:
+        """
+        Статический метод для загрузки и разбора снимка библиотеки.
+        Кэшируется по паре (путь, mtime): повторное создание Library в рамках процесса
+        не перечитывает и не разбирает файл заново, а внешнее изменение файла
+        автоматически инвалидирует кэш через новый mtime.
+        """
+        # читаем файл целиком одним системным вызовом и разбираем буфер за один проход
+        with open(path, "rb", buffering=1 << 20) as snapshot:
+            return [_intern_book(book) for book in _loads(snapshot.read())]
+
     def __post_init__(self):
         try:
-            with open("app/library.json", encoding="utf-8") as books_in_library:
-                self._books_data = json.load(books_in_library)
-        
-        except json.JSONDecodeError as e:
+            snapshot_mtime = os.path.getmtime(_LIBRARY_PATH)
+            # копируем словари книг, чтобы экземпляры Library не делили изменяемое состояние
+            self._books_data = [dict(book) for book in Library._load(_LIBRARY_PATH, snapshot_mtime)]
+
+        # ValueError покрывает и json.JSONDecodeError, и orjson.JSONDecodeError
+        except ValueError as e:
             print(f"Ошибка загрузки данных: {e}")
             self._books_data = []
 
         except FileNotFoundError: # создаем новый файл в случае, если библиотека еще не была создана
-            with open("app/library.json", "w", encoding="utf-8") as books_in_library:
-                json.dump([], books_in_library)
+            with open(_LIBRARY_PATH, "wb") as books_in_library:
+                books_in_library.write(_dumps([]))
+
+        # накатываем на снимок мутации, накопившиеся в журнале с последней компактизации
+        self._journal_size = 0
+        try:
+            with open(_JOURNAL_PATH, encoding="utf-8") as journal:
+                for entry_line in journal:
+                    try:
+                        self._apply_journal_entry(json.loads(entry_line))
+                    # оборванная при падении процесса или повреждённая запись:
+                    # прерываем реплей, сохранив восстановленное к этому моменту состояние —
+                    # следующая компактизация перезапишет журнал начисто
+                    except (ValueError, KeyError) as e:
+                        print(f"Ошибка чтения журнала, реплей остановлен: {e}")
+                        break
+                    self._journal_size += 1
+        except FileNotFoundError:
+            pass
+        self._journal = open(_JOURNAL_PATH, "a", encoding="utf-8", buffering=1 << 16)
+
+        # параллельный отсортированный список id книг для быстрого поиска через bisect
+        self._ids = [book.get("id") for book in self._books_data]
+        self._tombstones = 0
+
+        # обратные индексы по полям поиска: значение поля -> список книг с этим значением
+        self._by_author = defaultdict(list)
+        self._by_title = defaultdict(list)
+        self._by_year = defaultdict(list)
+        self._indexes = {"author": self._by_author, "title": self._by_title, "year": self._by_year}
+        # множество ключей уникальности: проверка на дубликат — одна операция in
+        self._unique_keys = set()
+        for book in self._books_data:
+            self.add_to_indexes(book)
+
+    def _apply_journal_entry(self, entry: Dict) -> None:
+        """
+        Метод для применения одной записи журнала к загруженному снимку библиотеки.
+        """
+        operation = entry["op"]
+        if operation == "add":
+            self._books_data.append(_intern_book(entry["book"]))
+        elif operation == "delete":
+            self._books_data = [book for book in self._books_data if book.get("id") != entry["id"]]
+        elif operation == "status":
+            for book in self._books_data:
+                if book.get("id") == entry["id"]:
+                    book["status"] = sys.intern(entry["status"])
+                    break
+
+    def log_operation(self, entry: Dict) -> None:
+        """
+        Метод для записи одной мутации в журнал.
+        Вместо перезаписи всего файла библиотеки каждая мутация дописывает одну строку;
+        при разрастании журнала выполняется компактизация в новый снимок.
+        """
+        self._journal.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._journal.flush()
+        self._journal_size += 1
+        if self._journal_size > max(len(self._books_data), 1) * _JOURNAL_COMPACT_FACTOR:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Метод для компактизации хранилища: записывает актуальный снимок во временный файл,
+        атомарно подменяет им старый через os.replace и очищает журнал.
+        """
+        # надгробия не должны попасть в снимок
+        if self._tombstones:
+            self._compact_tombstones()
+
+        temp_path = _LIBRARY_PATH + ".tmp"
+        with open(temp_path, "wb", buffering=1 << 20) as snapshot:
+            snapshot.write(_dumps(self._books_data))
+        os.replace(temp_path, _LIBRARY_PATH)
+
+        self._journal.close()
+        self._journal = open(_JOURNAL_PATH, "w", encoding="utf-8", buffering=1 << 16)
+        self._journal_size = 0
+
+    @staticmethod
+    def _index_key(value) -> str:
+        """
+        Статический метод для нормализации значения поля в ключ индекса.
+        casefold делает поиск нечувствительным к регистру за один проход по строке,
+        а приведение к str позволяет единообразно искать и по числовому полю year.
+        """
+        return str(value).casefold()
+
+    def add_to_indexes(self, book: Dict) -> None:
+        """Метод для добавления книги в обратные индексы и множество ключей уникальности."""
+        for search_field, index in self._indexes.items():
+            index[self._index_key(book.get(search_field))].append(book)
+        self._unique_keys.add((book.get("title"), book.get("author"), book.get("year")))
+
+    def remove_from_indexes(self, book: Dict) -> None:
+        """Метод для удаления книги из обратных индексов и множества ключей уникальности."""
+        for search_field, index in self._indexes.items():
+            index[self._index_key(book.get(search_field))].remove(book)
+        self._unique_keys.discard((book.get("title"), book.get("author"), book.get("year")))
+
+    def is_duplicate(self, title: str, author: str, year: int) -> bool:
+        """Метод для проверки, есть ли в библиотеке книга с такими названием, автором и годом."""
+        return (title, author, year) in self._unique_keys
+
+    def delete_at(self, index: int) -> Dict:
+        """
+        Метод для ленивого удаления книги по индексу.
+        Вместо O(n)-сдвига хвоста списка запись заменяется надгробием _DELETED;
+        id остаётся на месте, чтобы _ids сохранял отсортированность для bisect.
+        Когда надгробий становится больше половины, оба списка уплотняются.
+        """
+        deleted_book = self._books_data[index]
+        self._books_data[index] = _DELETED
+        self._tombstones += 1
+        if self._tombstones > len(self._books_data) // 2:
+            self._compact_tombstones()
+        return deleted_book
+
+    def _compact_tombstones(self) -> None:
+        """Метод для уплотнения списков книг и id после накопления надгробий."""
+        self._books_data = [book for book in self._books_data if book is not _DELETED]
+        self._ids = [book.get("id") for book in self._books_data]
+        self._tombstones = 0
+
+    def index_by(self, search_field: str) -> Dict:
+        """Метод для получения обратного индекса по заданному полю поиска."""
+        return self._indexes[search_field]
 
     @property
     def books_data(self) -> List[Dict]:
         """Свойство для получения атрибута books_data."""
         return self._books_data
 
+    @property
+    def ids(self) -> List[int]:
+        """Свойство для получения атрибута ids."""
+        return self._ids
+
+    def close(self) -> None:
+        """Метод для закрытия журнала мутаций."""
+        self._journal.close()
+
+
+class SQLiteLibrary:
+    """
+    Альтернативное хранилище библиотеки на SQLite (опционально, включается явно).
+    Поиск по id и автору выполняется по B-tree-индексам, мутации — одиночные
+    подготовленные запросы, а за целостность отвечает журнал самого SQLite.
+    При первом запуске выполняется одноразовая миграция книг из JSON-снимка.
+    """
+
+    _SEARCH_FIELDS = ("title", "author", "year")
+
+    def __init__(self, db_path: str = _DATABASE_PATH):
+        self._conn = sqlite3.connect(db_path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS books (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                author TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                status TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_books_author ON books(author);
+            """
+        )
+        self._migrate_from_json()
+
+    def _migrate_from_json(self) -> None:
+        """
+        Метод для одноразовой миграции книг из JSON-снимка в пустую базу.
+        """
+        if self._conn.execute("SELECT EXISTS(SELECT 1 FROM books)").fetchone()[0]:
+            return
+
+        try:
+            with open(_LIBRARY_PATH, "rb") as snapshot:
+                books = _loads(snapshot.read())
+        except (FileNotFoundError, ValueError):
+            return
+
+        self._conn.executemany(
+            "INSERT INTO books (id, title, author, year, status) "
+            "VALUES (:id, :title, :author, :year, :status)",
+            [{"status": AVAILABLE, **book} for book in books],
+        )
+        self._conn.commit()
+
+    def add_book(self, book: Dict) -> None:
+        """Метод для добавления книги одним подготовленным INSERT."""
+        self._conn.execute(
+            "INSERT INTO books (id, title, author, year, status) "
+            "VALUES (:id, :title, :author, :year, :status)",
+            book,
+        )
+        self._conn.commit()
+
+    def delete_book(self, book_id: int) -> bool:
+        """Метод для удаления книги по id. Возвращает, была ли книга найдена."""
+        cursor = self._conn.execute("DELETE FROM books WHERE id = ?", (book_id,))
+        self._conn.commit()
+        return cursor.rowcount > 0
+
+    def change_book_status(self, book_id: int) -> bool:
+        """Метод для переключения статуса книги одним UPDATE. Возвращает, была ли книга найдена."""
+        cursor = self._conn.execute(
+            "UPDATE books SET status = CASE status WHEN ? THEN ? ELSE ? END WHERE id = ?",
+            (AVAILABLE, BORROWED, AVAILABLE, book_id),
+        )
+        self._conn.commit()
+        return cursor.rowcount > 0
+
+    def find_book(self, book_id: int) -> Union[Dict, None]:
+        """Метод для поиска книги по первичному ключу id."""
+        row = self._conn.execute("SELECT * FROM books WHERE id = ?", (book_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def search_by(self, search_field: str, search_value) -> List[Dict]:
+        """Метод для поиска книг по конкретному полю (title, author, year)."""
+        if search_field not in self._SEARCH_FIELDS:
+            raise IncorrectSearchFields("Введено некорректное поле для поиска")
+        rows = self._conn.execute(
+            f"SELECT * FROM books WHERE {search_field} = ?", (search_value,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def all_books(self) -> List[Dict]:
+        """Метод для получения всех книг в порядке возрастания id."""
+        return [dict(row) for row in self._conn.execute("SELECT * FROM books ORDER BY id")]
+
+    def close(self) -> None:
+        """Метод для закрытия соединения с базой."""
+        self._conn.close()
+
 
 class MenuOptions(Enum):
     """
@@ -166,40 +520,68 @@ class MenuOptions(Enum):
     EXIT = ("0", "Выход")
 
 
+# Текст меню не меняется за время жизни процесса, поэтому собирается один раз при импорте.
+_MENU_TEXT = "\n--- Меню управления библиотекой ---\n" + "\n".join(
+    f"{option.value[0]}. {option.value[1]}" for option in MenuOptions
+)
+
+
+# Шапка и формат строки таблицы книг; связанный метод format избавляет
+# от повторного разбора f-строки на каждой строке таблицы.
+_TABLE_HEADER = f"{'ID':<4} | {'Title':<30} | {'Author':<20} | {'Year':<6} | {'Status':<10}"
+_TABLE_ROW_FORMAT = "{:<4} | {:<30} | {:<20} | {:<6} | {:<10}".format
+
+
+def _print_books_table(books: List[Dict], prefix_lines: List[str] = ()) -> None:
+    """
+    Функция для вывода таблицы книг одной записью в stdout.
+    Построчный print на большой библиотеке превращается в тысячи мелких записей,
+    поэтому все строки собираются заранее и выводятся одним вызовом write.
+    """
+    lines = list(prefix_lines)
+    lines.append(_TABLE_HEADER)
+    lines.append("-" * len(_TABLE_HEADER))
+    lines.extend(
+        _TABLE_ROW_FORMAT(book["id"], book["title"], book["author"], book["year"], book["status"])
+        for book in books
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
 class LibraryManager:
     """
     Класс для обработки запросов к библиотеке.
     """
-    
+
     def __init__(self):
         self.library = Library()
-
-    @staticmethod
-    def _update_data(books_data) -> None:
-        """
-        Статический метод для обновления данных в файле после внесенных изменений.
-        """
-        with open("app/library.json", "w", encoding="utf-8") as input_file:
-            json.dump(books_data, input_file, indent=4, ensure_ascii=False)
+        # таблица диспетчеризации команд меню: одна dict-выборка вместо перебора MenuOptions
+        self._dispatch = {
+            MenuOptions.ADD_BOOK.value[0]: self.handle_add_book,
+            MenuOptions.DELETE_BOOK.value[0]: self.handle_delete_book,
+            MenuOptions.CHANGE_STATUS.value[0]: self.handle_change_status,
+            MenuOptions.LIST_BOOKS.value[0]: self.handle_list_books,
+            MenuOptions.SEARCH_BOOKS.value[0]: self.handle_search_books,
+            MenuOptions.EXIT.value[0]: self.handle_exit,
+        }
 
     def _find_book_in_the_library(self, book_id: int, return_index: bool = False) -> Union[int, dict]:
         """
-        Метод для поиска книги в библиотеке, основанный на алгоритме бинарного поиска
+        Метод для поиска книги в библиотеке, основанный на бинарном поиске bisect_left
+        по отсортированному списку id.
         Именованный параметр return_index используется, когда нам нужен не сам объект книги,
         а его индекс, например, для удаления.
         """
-        low_bound = 0
-        high_bound = len(self.library.books_data) - 1
-        while low_bound <= high_bound:
-            mid = (low_bound + high_bound) // 2
-            if (target_book := self.library.books_data[mid].get("id")) == book_id:
-                if return_index:
-                    return mid
-                return target_book
-            if self.library.books_data[mid].get("id") > book_id:
-                high_bound = mid - 1
-            else:
-                low_bound = mid + 1
+        ids = self.library.ids
+        index = bisect_left(ids, book_id)
+        if index != len(ids) and ids[index] == book_id:
+            target_book = self.library.books_data[index]
+            # id удалённой книги остаётся в списке, но на её месте стоит надгробие
+            if target_book is _DELETED:
+                return -1
+            if return_index:
+                return index
+            return target_book
         return -1
 
     def _add_book(self, title: str, author: str, year: int) -> None:
@@ -207,8 +589,9 @@ class LibraryManager:
         Метод для добавления новой книги в библиотеку.
         """
         try:
-            if self.library.books_data:
-                last_added_book_id = self.library.books_data[-1].get("id")
+            # последний id берём из списка id: последняя запись книг может быть надгробием
+            if self.library.ids:
+                last_added_book_id = self.library.ids[-1]
             else:
                 last_added_book_id = 0 # на случай, если в библиотеке еще нет добавленных книг
             new_book = Book(last_added_book_id, title, author, year)
@@ -216,18 +599,18 @@ class LibraryManager:
             raise
         
         # проверяем на уникальность добавляемой книги
-        books_in_library_with_the_same_author = self._search_books_by(
-                                                                        f"author = {new_book.author}",
-                                                                        return_book_obj=True
-                                                                        )
-        if books_in_library_with_the_same_author:
-            for book in books_in_library_with_the_same_author:
-                if (book.get("title"), book.get("year")) == (new_book.title, new_book.year):
-                    raise AlreadyInTheLibrary(
-                        "Книга с такими автором, названием и годом издания уже существует в библиотеке"
-                        )
-        
-        self.library.books_data.append(new_book.to_dict())
+        if self.library.is_duplicate(new_book.title, new_book.author, new_book.year):
+            raise AlreadyInTheLibrary(
+                "Книга с такими автором, названием и годом издания уже существует в библиотеке"
+                )
+
+
+        # id всегда растут, поэтому append сохраняет оба списка отсортированными
+        new_book_dict = new_book.to_dict()
+        self.library.books_data.append(new_book_dict)
+        self.library.ids.append(new_book.id)
+        self.library.add_to_indexes(new_book_dict)
+        self.library.log_operation({"op": "add", "book": new_book_dict})
 
     def _delete_book(self, book_id: int):
         """
@@ -237,7 +620,9 @@ class LibraryManager:
         if book_index == -1:
             raise NotFoundInTheLibrary("Книга с таким идентификатором не найдена в библиотеке")
         
-        self.library.books_data.pop(book_index)
+        deleted_book = self.library.delete_at(book_index)
+        self.library.remove_from_indexes(deleted_book)
+        self.library.log_operation({"op": "delete", "id": book_id})
 
     def _change_book_status(self, book_id: int) -> None:
         """
@@ -249,21 +634,18 @@ class LibraryManager:
         if book_index == -1:
             raise NotFoundInTheLibrary("Книга с таким идентификатором не найдена в библиотеке")
         
-        if self.library.books_data[book_index]["status"] == "В наличии":
-            self.library.books_data[book_index]["status"] = "Выдана"
-        else:
-            self.library.books_data[book_index]["status"] = "В наличии"
+        book = self.library.books_data[book_index]
+        # неизвестный статус (файл библиотеки может быть отредактирован вручную)
+        # сбрасывается в "В наличии", как делало исходное ветвление if/else
+        new_status = _NEXT_STATUS.get(book["status"], AVAILABLE)
+        book["status"] = new_status
+        self.library.log_operation({"op": "status", "id": book_id, "status": new_status})
 
     def _list_all_books(self) -> None:
         """
         Метод для вывода информации обо всех книгах.
         """
-        header = f"{'ID':<4} | {'Title':<30} | {'Author':<20} | {'Year':<6} | {'Status':<10}"
-        print(header)
-        print("-" * len(header))
-        
-        for book in self.library.books_data:
-            print(f"{book['id']:<4} | {book['title']:<30} | {book['author']:<20} | {book['year']:<6} | {book['status']:<10}")
+        _print_books_table([book for book in self.library.books_data if book is not _DELETED])
 
     def _search_books_by(self, search_query: str, return_book_obj=False) -> None:
         """
@@ -273,24 +655,19 @@ class LibraryManager:
         """
         search_field, search_value = search_query.split(" = ")
         search_field = search_field.lower().strip()
-        search_value = search_value.title().strip()
-        
+        # ключи индексов нормализованы через casefold, поэтому дорогой title() не нужен
+        search_value = search_value.strip().casefold()
+
         if search_field not in ("title", "author", "year"):
             raise IncorrectSearchFields("Введено некорректное поле для поиска")
 
-        search_results = [book for book in self.library.books_data if book.get(search_field) == search_value]
+        search_results = self.library.index_by(search_field).get(search_value, [])
         
         if search_results:
             if return_book_obj:
                 return search_results
 
-            print("\nПо вашему запросу найдены следующие результаты:\n")
-            header = f"{'ID':<4} | {'Title':<30} | {'Author':<20} | {'Year':<6} | {'Status':<10}"
-            print(header)
-            print("-" * len(header))
-            
-            for book in search_results:
-                print(f"{book['id']:<4} | {book['title']:<30} | {book['author']:<20} | {book['year']:<6} | {book['status']:<10}")
+            _print_books_table(search_results, ["\nПо вашему запросу найдены следующие результаты:\n"])
         else:
             if return_book_obj:
                 return []
@@ -315,7 +692,6 @@ class LibraryManager:
                 print("\nОшибка: Параметры добавляемой книги должны быть указаны в формате: "
                       "<название>, <автор>, <год>, а в качестве разделителя должен использоваться ', '")
             else:
-                self._update_data(self.library.books_data)
                 print("\nКнига успешно добавлена.")
                 break
 
@@ -335,7 +711,6 @@ class LibraryManager:
             except NotFoundInTheLibrary as exc:
                 print(f"\nОшибка: {exc}. Попробуйте снова.")
             else:
-                self._update_data(self.library.books_data)
                 print("\nКнига успешно удалена.")
                 break
 
@@ -355,7 +730,6 @@ class LibraryManager:
             except NotFoundInTheLibrary as exc:
                 print(f"\nОшибка: {exc}. Попробуйте снова.")
             else:
-                self._update_data(self.library.books_data)
                 print("\nСтатус книги успешно изменён.")
                 break
 
@@ -383,6 +757,7 @@ class LibraryManager:
 
     def handle_exit(self) -> None:
         """Обработка команды выхода."""
+        self.library.close()
         print("\nВыход из программы...")
 
     def run(self) -> None:
@@ -390,36 +765,18 @@ class LibraryManager:
         Метод для вызова функции менеджера, соответствующей введённой в консоль команде.
         """
         while True:
-            print("\n--- Меню управления библиотекой ---")
+            print(_MENU_TEXT)
 
-            
-            for option in MenuOptions:
-                print(f"{option.value[0]}. {option.value[1]}")
-            
             choice = input("Введите номер команды: ").strip()
 
-            selected_option = None
-            for option in MenuOptions:
-                if option.value[0] == choice:  # Сравниваем строковое значение с первым элементом кортежа
-                    selected_option = option
-                    break
-            if selected_option is None:
+            handler = self._dispatch.get(choice)
+            if handler is None:
                 raise ValueError("\nНекорректный ввод, попробуйте снова.")
-            
-            match selected_option:
-                case MenuOptions.ADD_BOOK:
-                    self.handle_add_book()
-                case MenuOptions.DELETE_BOOK:
-                    self.handle_delete_book()
-                case MenuOptions.CHANGE_STATUS:
-                    self.handle_change_status()
-                case MenuOptions.LIST_BOOKS:
-                    self.handle_list_books()
-                case MenuOptions.SEARCH_BOOKS:
-                    self.handle_search_books()
-                case MenuOptions.EXIT:
-                    self.handle_exit()
-                    break
+
+            handler()
+            # сравнение по ==, а не is: связанный метод создаётся заново при каждом обращении
+            if handler == self.handle_exit:
+                break
 
 
 if __name__ == "__main__":
@@ -1,7 +1,10 @@
 import json
+import os
+import tempfile
 import unittest
 
-from app.main import Book, Library
+from app import main as app_main
+from app.main import Book, Library, SQLiteLibrary
 
 
 def setUpModule():
@@ -93,10 +96,136 @@ class LibraryClassTestCase(unittest.TestCase):
 
     def test_books_data_property(self):
         library = Library()
+        self.addCleanup(library.close)
         with open("app/library.json", encoding="utf-8") as library_data:
             data = json.load(library_data)
         self.assertEqual(library.books_data, data)
 
 
+class LibraryStorageTestCase(unittest.TestCase):
+    """
+    Класс, предназначенный для тестирования журнала мутаций, компактизации
+    и ленивого удаления через надгробия
+    """
+
+    def setUp(self):
+        # переносим файлы хранилища во временный каталог, чтобы не трогать app/library.json
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        self._library_path = app_main._LIBRARY_PATH
+        self._journal_path = app_main._JOURNAL_PATH
+        app_main._LIBRARY_PATH = os.path.join(self._temp_dir.name, "library.json")
+        app_main._JOURNAL_PATH = os.path.join(self._temp_dir.name, "library.jsonl")
+        Library._load.cache_clear()
+
+    def tearDown(self):
+        app_main._LIBRARY_PATH = self._library_path
+        app_main._JOURNAL_PATH = self._journal_path
+        Library._load.cache_clear()
+
+    def _make_manager(self):
+        manager = app_main.LibraryManager()
+        self.addCleanup(manager.library.close)
+        return manager
+
+    def test_mutations_survive_restart_via_journal_replay(self):
+        manager = self._make_manager()
+        manager._add_book("Book1", "Ivan Ivanov", 2000)
+        manager._add_book("Book2", "Ivan Ivanov", 2001)
+        manager._change_book_status(1)
+
+        restarted = self._make_manager()
+        self.assertEqual(len(restarted.library.books_data), 2)
+        self.assertEqual(restarted.library.books_data[0]["status"], "Выдана")
+        self.assertEqual(restarted.library.ids, [1, 2])
+
+    def test_compaction_truncates_journal_and_preserves_state(self):
+        manager = self._make_manager()
+        manager._add_book("Book1", "Ivan Ivanov", 2000)
+        manager._add_book("Book2", "Ivan Ivanov", 2001)
+        manager._delete_book(1)
+        manager.library.compact()
+
+        with open(app_main._JOURNAL_PATH, encoding="utf-8") as journal:
+            self.assertEqual(journal.read(), "")
+        with open(app_main._LIBRARY_PATH, encoding="utf-8") as snapshot:
+            self.assertEqual([book["id"] for book in json.load(snapshot)], [2])
+
+        restarted = self._make_manager()
+        self.assertEqual(restarted.library.books_data, manager.library.books_data)
+
+    def test_replay_survives_torn_journal_entry(self):
+        manager = self._make_manager()
+        manager._add_book("Book1", "Ivan Ivanov", 2000)
+        manager._add_book("Book2", "Ivan Ivanov", 2001)
+        # имитируем падение процесса посреди дозаписи в журнал
+        with open(app_main._JOURNAL_PATH, "a", encoding="utf-8") as journal:
+            journal.write('{"op": "add", "boo')
+
+        # перезапуск не падает и сохраняет состояние, восстановленное до оборванной записи
+        restarted = self._make_manager()
+        self.assertEqual([book["id"] for book in restarted.library.books_data], [1, 2])
+
+        # компактизация перезаписывает журнал начисто, оборванная запись исчезает
+        restarted.library.compact()
+        with open(app_main._JOURNAL_PATH, encoding="utf-8") as journal:
+            self.assertEqual(journal.read(), "")
+
+    def test_lookup_and_re_add_with_pending_tombstone(self):
+        manager = self._make_manager()
+        for year in (2000, 2001, 2002, 2003):
+            manager._add_book("Book1", "Ivan Ivanov", year)
+        manager._delete_book(2)
+
+        # надгробие ещё не уплотнено: на месте книги стоит сентинел, id остался в списке
+        self.assertIs(manager.library.books_data[1], app_main._DELETED)
+        self.assertEqual(manager.library.ids, [1, 2, 3, 4])
+        self.assertEqual(manager._find_book_in_the_library(2), -1)
+        self.assertEqual(manager._find_book_in_the_library(3)["year"], 2002)
+
+        # удалённую книгу можно добавить заново, и поиск находит только новую запись
+        manager._add_book("Book1", "Ivan Ivanov", 2001)
+        self.assertEqual(manager.library.ids[-1], 5)
+        found_books = manager._search_books_by("year = 2001", return_book_obj=True)
+        self.assertEqual([book["id"] for book in found_books], [5])
+
+
+class SQLiteLibraryClassTestCase(unittest.TestCase):
+    """
+    Класс, предназначенный для тестирования функционала класса SQLiteLibrary
+    """
+
+    def setUp(self):
+        self.library = SQLiteLibrary(":memory:")
+        # очищаем книги, попавшие в базу при миграции из JSON-снимка
+        self.library._conn.execute("DELETE FROM books")
+        self.library.add_book(
+            {"id": 1, "title": "Book1", "author": "Ivan Ivanov", "year": 2000, "status": "В наличии"}
+        )
+
+    def tearDown(self):
+        self.library.close()
+
+    def test_find_book(self):
+        book = self.library.find_book(1)
+        self.assertEqual(book["title"], "Book1")
+        self.assertIsNone(self.library.find_book(99))
+
+    def test_delete_book(self):
+        self.assertTrue(self.library.delete_book(1))
+        self.assertFalse(self.library.delete_book(1))
+        self.assertEqual(self.library.all_books(), [])
+
+    def test_change_book_status(self):
+        self.assertTrue(self.library.change_book_status(1))
+        self.assertEqual(self.library.find_book(1)["status"], "Выдана")
+        self.library.change_book_status(1)
+        self.assertEqual(self.library.find_book(1)["status"], "В наличии")
+
+    def test_search_by(self):
+        self.assertEqual(len(self.library.search_by("author", "Ivan Ivanov")), 1)
+        self.assertEqual(self.library.search_by("year", 1999), [])
+
+
 if __name__ == "__main__":
     unittest.main()